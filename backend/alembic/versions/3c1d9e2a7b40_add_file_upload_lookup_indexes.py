@@ -0,0 +1,30 @@
+"""Add file upload lookup indexes
+
+Revision ID: 3c1d9e2a7b40
+Revises: 766b7f5cbeb2
+Create Date: 2026-10-15 09:12:44.120318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d9e2a7b40'
+down_revision: Union[str, None] = '766b7f5cbeb2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_cm_file_src', 'column_mappings', ['file_upload_id', 'source_column'], unique=False)
+    op.create_index(op.f('ix_raw_employee_data_file_upload_id'), 'raw_employee_data', ['file_upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_raw_employee_data_file_upload_id'), table_name='raw_employee_data')
+    op.drop_index('ix_cm_file_src', table_name='column_mappings')
@@ -0,0 +1,42 @@
+"""Add data corrections
+
+Revision ID: 8e4f2b6d1a93
+Revises: 3c1d9e2a7b40
+Create Date: 2026-10-15 10:41:07.512946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f2b6d1a93'
+down_revision: Union[str, None] = '3c1d9e2a7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('data_corrections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('file_upload_id', sa.Integer(), nullable=True),
+    sa.Column('row_index', sa.Integer(), nullable=False),
+    sa.Column('column_name', sa.String(), nullable=False),
+    sa.Column('old_value', sa.JSON(), nullable=True),
+    sa.Column('new_value', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['file_upload_id'], ['file_uploads.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_data_corrections_id'), 'data_corrections', ['id'], unique=False)
+    op.create_index(op.f('ix_data_corrections_file_upload_id'), 'data_corrections', ['file_upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_data_corrections_file_upload_id'), table_name='data_corrections')
+    op.drop_index(op.f('ix_data_corrections_id'), table_name='data_corrections')
+    op.drop_table('data_corrections')
@@ -0,0 +1,38 @@
+"""Partial index on completed validation runs
+
+Revision ID: a4c7e1d9b368
+Revises: f3a8d2e6b194
+Create Date: 2026-10-15 13:48:27.310975
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e1d9b368'
+down_revision: Union[str, None] = 'f3a8d2e6b194'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_validation_runs_file_status_completed', table_name='validation_runs')
+    op.create_index(
+        'ix_validation_runs_completed_partial',
+        'validation_runs',
+        ['file_upload_id', 'completed_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'completed'")
+    )
+    op.create_index(op.f('ix_validation_runs_file_upload_id'), 'validation_runs', ['file_upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_validation_runs_file_upload_id'), table_name='validation_runs')
+    op.drop_index('ix_validation_runs_completed_partial', table_name='validation_runs')
+    op.create_index('ix_validation_runs_file_status_completed', 'validation_runs', ['file_upload_id', 'status', 'completed_at'], unique=False)
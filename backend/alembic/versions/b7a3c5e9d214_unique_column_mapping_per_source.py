@@ -0,0 +1,38 @@
+"""Unique column mapping per source column
+
+Revision ID: b7a3c5e9d214
+Revises: 8e4f2b6d1a93
+Create Date: 2026-10-15 11:26:53.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a3c5e9d214'
+down_revision: Union[str, None] = '8e4f2b6d1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest mapping for any duplicated (file, source column) pair
+    op.execute("""
+        DELETE FROM column_mappings
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM column_mappings
+            GROUP BY file_upload_id, source_column
+        )
+    """)
+    op.drop_index('ix_cm_file_src', table_name='column_mappings')
+    op.create_index('ix_cm_file_src', 'column_mappings', ['file_upload_id', 'source_column'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cm_file_src', table_name='column_mappings')
+    op.create_index('ix_cm_file_src', 'column_mappings', ['file_upload_id', 'source_column'], unique=False)
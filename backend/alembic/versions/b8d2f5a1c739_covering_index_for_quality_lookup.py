@@ -0,0 +1,43 @@
+"""Covering index for the quality score lookup
+
+Revision ID: b8d2f5a1c739
+Revises: a4c7e1d9b368
+Create Date: 2026-10-15 14:06:51.902318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f5a1c739'
+down_revision: Union[str, None] = 'a4c7e1d9b368'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_validation_runs_completed_partial', table_name='validation_runs')
+    op.create_index(
+        'ix_vr_quality_lookup',
+        'validation_runs',
+        ['file_upload_id', 'completed_at'],
+        unique=False,
+        postgresql_include=['id', 'data_quality_score'],
+        postgresql_where=sa.text("status = 'completed'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_vr_quality_lookup', table_name='validation_runs')
+    op.create_index(
+        'ix_validation_runs_completed_partial',
+        'validation_runs',
+        ['file_upload_id', 'completed_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'completed'")
+    )
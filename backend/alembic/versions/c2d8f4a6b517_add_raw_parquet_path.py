@@ -0,0 +1,28 @@
+"""Add raw parquet path to file uploads
+
+Revision ID: c2d8f4a6b517
+Revises: b7a3c5e9d214
+Create Date: 2026-10-15 12:03:18.664092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d8f4a6b517'
+down_revision: Union[str, None] = 'b7a3c5e9d214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('file_uploads', sa.Column('raw_parquet_path', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('file_uploads', 'raw_parquet_path')
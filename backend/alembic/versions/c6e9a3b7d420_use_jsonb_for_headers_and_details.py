@@ -0,0 +1,45 @@
+"""Use JSONB for upload headers and validation details
+
+Revision ID: c6e9a3b7d420
+Revises: b8d2f5a1c739
+Create Date: 2026-10-15 14:38:19.674502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e9a3b7d420'
+down_revision: Union[str, None] = 'b8d2f5a1c739'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('file_uploads', 'headers',
+                    existing_type=sa.JSON(),
+                    type_=postgresql.JSONB(),
+                    postgresql_using='headers::jsonb')
+    op.alter_column('validation_results', 'details',
+                    existing_type=sa.JSON(),
+                    type_=postgresql.JSONB(),
+                    existing_nullable=True,
+                    postgresql_using='details::jsonb')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('validation_results', 'details',
+                    existing_type=postgresql.JSONB(),
+                    type_=sa.JSON(),
+                    existing_nullable=True,
+                    postgresql_using='details::json')
+    op.alter_column('file_uploads', 'headers',
+                    existing_type=postgresql.JSONB(),
+                    type_=sa.JSON(),
+                    postgresql_using='headers::json')
@@ -0,0 +1,28 @@
+"""Add validation results file/created index
+
+Revision ID: d5e1a7c3f820
+Revises: c2d8f4a6b517
+Create Date: 2026-10-15 12:37:45.018223
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e1a7c3f820'
+down_revision: Union[str, None] = 'c2d8f4a6b517'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_valres_file_created', 'validation_results', ['file_upload_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_valres_file_created', table_name='validation_results')
@@ -0,0 +1,28 @@
+"""Add validation runs file/status/completed index
+
+Revision ID: e9b4c1f7a052
+Revises: d5e1a7c3f820
+Create Date: 2026-10-15 13:05:12.447901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b4c1f7a052'
+down_revision: Union[str, None] = 'd5e1a7c3f820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_validation_runs_file_status_completed', 'validation_runs', ['file_upload_id', 'status', 'completed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_validation_runs_file_status_completed', table_name='validation_runs')
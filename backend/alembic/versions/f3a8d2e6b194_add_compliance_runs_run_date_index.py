@@ -0,0 +1,28 @@
+"""Add compliance test runs run_date/id index
+
+Revision ID: f3a8d2e6b194
+Revises: e9b4c1f7a052
+Create Date: 2026-10-15 13:31:08.562214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d2e6b194'
+down_revision: Union[str, None] = 'e9b4c1f7a052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_compliance_test_runs_run_date_id', 'compliance_test_runs', ['run_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_compliance_test_runs_run_date_id', table_name='compliance_test_runs')
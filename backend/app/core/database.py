@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -8,8 +9,24 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+url = make_url(DATABASE_URL)
+
+# Check connections on checkout and recycle them hourly so requests never
+# land on a connection the server or a proxy has already dropped
+engine_options = {"pool_pre_ping": True, "pool_recycle": 3600}
+if url.get_backend_name() != "sqlite":
+    # Keep enough warm connections for concurrent requests instead of
+    # reconnecting once the default five are busy
+    engine_options.update(pool_size=20, max_overflow=10, pool_timeout=30)
+if url.get_driver_name() == "psycopg2":
+    # Batch executemany UPDATE/DELETE statements too, not just INSERTs
+    engine_options["executemany_mode"] = "values_plus_batch"
+
+engine = create_engine(DATABASE_URL, **engine_options)
+# Objects stay loaded after commit; handlers build their responses from them
+# right after committing, and expiring them would reload each one with an
+# extra SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, Boolean, Numeric, Float, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, Boolean, Numeric, Float, Enum, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -6,6 +7,10 @@ import enum
 
 from datetime import datetime
 
+# Binary JSON on Postgres: parsed once on write instead of on every read, and
+# GIN-indexable if we ever filter on keys; plain JSON elsewhere (SQLite)
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
 class User(Base):
     __tablename__ = "users"
     
@@ -47,18 +52,20 @@ class FileUpload(Base):
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     row_count = Column(Integer)
     column_count = Column(Integer)
-    headers = Column(JSON)  # Store headers as JSON array
+    headers = Column(JSONBType)  # Store headers as JSON array
     
     # Fix-related columns added by migration
     has_fixes_applied = Column(Boolean, default=False)
     fix_session_count = Column(Integer, default=0)
     last_fix_applied = Column(DateTime, nullable=True)
     backup_file_path = Column(String(500), nullable=True)
+    raw_parquet_path = Column(String(500), nullable=True)  # Columnar snapshot of the parsed rows
 
     # Relationships
     raw_data = relationship("RawEmployeeData", back_populates="file_upload", cascade="all, delete")
     employee_data = relationship("EmployeeData", back_populates="file_upload", cascade="all, delete")
     column_mappings = relationship("ColumnMapping", back_populates="file_upload", cascade="all, delete")
+    data_corrections = relationship("DataCorrection", back_populates="file_upload", cascade="all, delete")
     compliance_runs = relationship("ComplianceTestRun", back_populates="file")
     processing_jobs = relationship("ProcessingJob", back_populates="file_upload")
     validation_results = relationship("ValidationResult", back_populates="file_upload")
@@ -139,7 +146,7 @@ class RawEmployeeData(Base):
     __tablename__ = "raw_employee_data"
     
     id = Column(Integer, primary_key=True, index=True)
-    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"))
+    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"), index=True)
     row_data = Column(JSON)  # Store the raw row data as JSON
     mapped_record_id = Column(Integer, ForeignKey("employee_data.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -163,6 +170,24 @@ class ColumnMapping(Base):
     # Relationships
     file_upload = relationship("FileUpload", back_populates="column_mappings")
     user = relationship("User") 
+    
+    __table_args__ = (
+        Index("ix_cm_file_src", "file_upload_id", "source_column", unique=True),
+    )
+
+class DataCorrection(Base):
+    __tablename__ = "data_corrections"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"), index=True)
+    row_index = Column(Integer, nullable=False)  # DataFrame row of the uploaded file
+    column_name = Column(String, nullable=False)
+    old_value = Column(JSON, nullable=True)
+    new_value = Column(JSON, nullable=True)  # Replayed over the file whenever it is read
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    file_upload = relationship("FileUpload", back_populates="data_corrections")
 
 
 class ComplianceTestRun(Base):
@@ -175,11 +200,18 @@ class ComplianceTestRun(Base):
     passed_tests = Column(Integer)
     failed_tests = Column(Integer)
     
-    # Relationship to file
-    file = relationship("FileUpload", back_populates="compliance_runs")
+    # Relationship to file. Both relationships raise on lazy access, so
+    # every query that needs them has to choose a loader (joinedload,
+    # selectinload) instead of silently issuing one query per run
+    file = relationship("FileUpload", back_populates="compliance_runs", lazy="raise")
     
     # Relationship to individual test results
-    test_results = relationship("ComplianceTestResult", back_populates="test_run")
+    test_results = relationship("ComplianceTestResult", back_populates="test_run", lazy="raise")
+    
+    __table_args__ = (
+        # Keyset pagination order for the history endpoint
+        Index("ix_compliance_test_runs_run_date_id", "run_date", "id"),
+    )
 
 class ComplianceTestResult(Base):
     __tablename__ = "compliance_test_results"
@@ -219,7 +251,7 @@ class ValidationResult(Base):
     auto_fixable = Column(Boolean, default=False)
     is_resolved = Column(Boolean, default=False)
     confidence_score = Column(Numeric(5, 2), nullable=True)  # Changed from Float to Numeric for precision
-    details = Column(JSON, nullable=True)
+    details = Column(JSONBType, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())  # Use timezone-aware
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())        # Added updated_at
     resolved_at = Column(DateTime, nullable=True)
@@ -227,9 +259,13 @@ class ValidationResult(Base):
     resolved_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # Added FK constraint
 
     # Relationships
-    file_upload = relationship("FileUpload", back_populates="validation_results")
+    file_upload = relationship("FileUpload", back_populates="validation_results", lazy="raise")
     resolved_by_user = relationship("User", foreign_keys=[resolved_by])  # Added relationship
 
+    __table_args__ = (
+        Index("ix_valres_file_created", "file_upload_id", "created_at"),
+    )
+
 class DataQualityScore(Base):
     __tablename__ = "data_quality_scores"
 
@@ -257,13 +293,13 @@ class DataQualityScore(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Fix relationship name to match FileUpload
-    file_upload = relationship("FileUpload", back_populates="data_quality_scores")
+    file_upload = relationship("FileUpload", back_populates="data_quality_scores", lazy="raise")
 
 class ValidationRun(Base):
     __tablename__ = "validation_runs"
 
     id = Column(Integer, primary_key=True, index=True)
-    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"))
+    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"), index=True)
     status = Column(String(20), default="running")
     validation_config = Column(JSON)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -275,7 +311,22 @@ class ValidationRun(Base):
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())  # ADD THIS LINE
 
-    file_upload = relationship("FileUpload", back_populates="validation_runs")
+    file_upload = relationship("FileUpload", back_populates="validation_runs", lazy="raise")
+
+    __table_args__ = (
+        # Latest completed run per file. Only completed runs are indexed, so
+        # the index stays small and needs no status recheck, and it carries
+        # every column get_quality_score reads for an index-only scan; other
+        # per-file lookups use the plain file_upload_id index
+        Index(
+            "ix_vr_quality_lookup",
+            "file_upload_id",
+            "completed_at",
+            postgresql_include=["id", "data_quality_score"],
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'")
+        ),
+    )
 
 # Fix-related models
 class FixHistory(Base):
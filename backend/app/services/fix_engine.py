@@ -10,8 +10,8 @@ from datetime import datetime, date
 from sqlalchemy.orm import Session
 import io
 
-from ..models.models import FileUpload, ValidationResult
-from .validation_engine import DataValidationEngine
+from ..models.models import FileUpload, ValidationResult, DataCorrection
+from .validation_engine import DataValidationEngine, load_corrections, apply_corrections
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +27,13 @@ class IssueFixEngine:
         """Load the file data into a pandas DataFrame."""
         try:
             if self.file_upload.file_path.endswith('.xlsx'):
-                return pd.read_excel(self.file_upload.file_path)
+                df = pd.read_excel(self.file_upload.file_path)
             elif self.file_upload.file_path.endswith('.csv'):
-                return pd.read_csv(self.file_upload.file_path)
+                df = pd.read_csv(self.file_upload.file_path)
             else:
                 raise ValueError(f"Unsupported file format: {self.file_upload.file_path}")
+            # Include auto-fix corrections stored alongside the file
+            return apply_corrections(df, load_corrections(self.db, self.file_upload.id))
         except Exception as e:
             logger.error(f"Error loading dataframe: {str(e)}")
             raise
@@ -359,6 +361,11 @@ class IssueFixEngine:
                 self.df.to_excel(self.file_upload.file_path, index=False)
             elif self.file_upload.file_path.endswith('.csv'):
                 self.df.to_csv(self.file_upload.file_path, index=False)
+            
+            # The written file already contains any stored corrections
+            self.db.query(DataCorrection).filter(
+                DataCorrection.file_upload_id == self.file_upload.id
+            ).delete()
                 
             # Update file modification time
             self.file_upload.updated_at = datetime.utcnow()
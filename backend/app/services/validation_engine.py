@@ -12,11 +12,18 @@ from enum import Enum
 import re
 import logging
 from sqlalchemy.orm import Session
-from ..models.models import FileUpload, ValidationResult, EmployeeData, DataQualityScore
+from ..models.models import FileUpload, ValidationResult, EmployeeData, DataQualityScore, DataCorrection
 
 
 logger = logging.getLogger(__name__)
 
+# Columns the engine reads by name; callers that load only part of an upload
+# must keep every one of these the file has, whether or not it is mapped
+VALIDATED_COLUMNS = frozenset({
+    'SSN', 'EEID', 'DOB', 'DOH', 'DOT', 'PriorYearComp', 'EmployeeDeferrals',
+    'EmployerMatch', 'HoursWorked', '%Ownership', 'Officer', 'Gender'
+})
+
 class IssueType(Enum):
     CRITICAL = "critical"
     WARNING = "warning"
@@ -59,6 +66,56 @@ class ValidationIssue:
             self.details = {}
         self.affected_employees = len(set(self.affected_rows))
 
+def _to_json_value(value: Any) -> Any:
+    """Convert a DataFrame cell into a JSON-storable value"""
+    if pd.isnull(value):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value if isinstance(value, (str, int, float, bool)) else str(value)
+
+def diff_corrections(original_df: pd.DataFrame, corrected_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    List the cells auto-fixing changed, so they can be stored as a delta
+    instead of rewriting the uploaded file
+    """
+    corrections = []
+    for column in corrected_df.columns:
+        before = original_df[column]
+        after = corrected_df[column]
+        changed = ~((before == after) | (before.isna() & after.isna()))
+        for row_index in changed[changed].index:
+            corrections.append({
+                "row_index": int(row_index),
+                "column_name": column,
+                "old_value": _to_json_value(before.at[row_index]),
+                "new_value": _to_json_value(after.at[row_index])
+            })
+    return corrections
+
+def load_corrections(db: Session, file_upload_id: int) -> List[Tuple[int, str, Any]]:
+    """Fetch a file's stored corrections in the order they were made"""
+    return db.query(
+        DataCorrection.row_index, DataCorrection.column_name, DataCorrection.new_value
+    ).filter(
+        DataCorrection.file_upload_id == file_upload_id
+    ).order_by(DataCorrection.id).all()
+
+def apply_corrections(df: pd.DataFrame, corrections: List[Tuple[int, str, Any]]) -> pd.DataFrame:
+    """Replay stored (row_index, column_name, new_value) corrections onto a freshly read file"""
+    touched = set()
+    for row_index, column, value in corrections:
+        if column not in df.columns or row_index not in df.index:
+            continue
+        if column not in touched:
+            # Corrections may change a cell's type (e.g. '$1,000' -> 1000.0)
+            df[column] = df[column].astype(object)
+            touched.add(column)
+        df.at[row_index, column] = value
+    for column in touched:
+        df[column] = df[column].infer_objects()
+    return df
+
 class DataValidationEngine:
     """
     Comprehensive data validation engine for 401(k) employee census data
@@ -66,7 +123,9 @@ class DataValidationEngine:
     """
     
     def __init__(self, df: pd.DataFrame, file_upload_id: int, db: Session, historical_data: Optional[pd.DataFrame] = None):
-        self.df = df.copy()
+        # Checks only read self.df and apply_auto_fixes works on its own copy,
+        # so keep a reference rather than doubling peak memory on large files
+        self.df = df
         self.file_upload_id = file_upload_id
         self.db = db
         self.historical_data = historical_data
@@ -181,19 +240,28 @@ class DataValidationEngine:
         if field not in self.df.columns:
             return
         
-        invalid_dates = []
-        for idx, value in self.df[field].items():
-            if pd.isnull(value):
-                continue
-            
+        values = self.df[field]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return
+        
+        values = values.dropna()
+        is_str = values.map(lambda v: isinstance(v, str)).astype(bool)
+        is_datetime = values.map(lambda v: isinstance(v, (datetime, pd.Timestamp))).astype(bool)
+        
+        # Parse every string in one cached pass (dates repeat heavily across
+        # employees); only the failures are retried one at a time, since
+        # to_datetime also accepts null-like strings such as ''
+        strings = values[is_str]
+        parsed = pd.to_datetime(strings, format='%Y-%m-%d', errors='coerce', cache=True)
+        unparsed = []
+        for idx, value in strings[parsed.isna()].items():
             try:
-                if isinstance(value, str):
-                    # Try common date formats
-                    pd.to_datetime(value, format='%Y-%m-%d', errors='raise')
-                elif not isinstance(value, (datetime, pd.Timestamp)):
-                    invalid_dates.append(idx)
-            except:
-                invalid_dates.append(idx)
+                pd.to_datetime(value, format='%Y-%m-%d', errors='raise')
+            except (ValueError, TypeError):
+                unparsed.append(idx)
+        
+        invalid_mask = (~is_str & ~is_datetime) | values.index.isin(unparsed)
+        invalid_dates = values.index[invalid_mask].tolist()
         
         if invalid_dates:
             self.validation_issues.append(ValidationIssue(
@@ -216,15 +284,8 @@ class DataValidationEngine:
             return
         
         ssn_pattern = re.compile(r'^\d{3}-?\d{2}-?\d{4}$|^\d{9}$')
-        invalid_ssns = []
-        
-        for idx, ssn in self.df['SSN'].items():
-            if pd.isnull(ssn):
-                continue
-            
-            ssn_str = str(ssn).strip()
-            if not ssn_pattern.match(ssn_str):
-                invalid_ssns.append(idx)
+        ssns = self.df['SSN'].dropna().astype(str).str.strip()
+        invalid_ssns = ssns.index[~ssns.str.match(ssn_pattern)].tolist()
         
         if invalid_ssns:
             self.validation_issues.append(ValidationIssue(
@@ -246,11 +307,16 @@ class DataValidationEngine:
         if field not in self.df.columns:
             return
         
+        values = self.df[field]
+        if pd.api.types.is_numeric_dtype(values):
+            return
+        
+        # Coerce the whole column at once, then confirm the few failures with
+        # float() so values it accepts (e.g. 'nan', ' 12 ') stay valid
+        coerced = pd.to_numeric(values, errors='coerce')
+        candidates = values[values.notna() & coerced.isna()]
         invalid_numeric = []
-        for idx, value in self.df[field].items():
-            if pd.isnull(value):
-                continue
-            
+        for idx, value in candidates.items():
             try:
                 float(value)
             except (ValueError, TypeError):
@@ -295,10 +361,7 @@ class DataValidationEngine:
             return
         
         logic_errors = []
-        for idx, row in self.df.iterrows():
-            doh = row.get(doh_col)
-            dot = row.get(dot_col)
-            
+        for idx, doh, dot in self.df[[doh_col, dot_col]].itertuples(name=None):
             if pd.isnull(doh) or pd.isnull(dot):
                 continue
             
@@ -511,6 +574,45 @@ class DataValidationEngine:
                 }
             ))
     
+    def _analyze_gender_distribution(self):
+        """Flag gender values recorded in more than one coding (e.g. 'M' and 'Male')"""
+        if 'Gender' not in self.df.columns:
+            return
+        
+        genders = self.df['Gender'].dropna().astype(str).str.strip()
+        genders = genders[genders != '']
+        if genders.empty:
+            return
+        
+        canonical = genders.str.upper().replace({'MALE': 'M', 'FEMALE': 'F'})
+        spellings = genders.groupby(canonical).value_counts()
+        mixed = [code for code in canonical.unique() if len(spellings[code]) > 1]
+        if not mixed:
+            return
+        
+        # Rows not using the most common spelling of their gender
+        preferred = {code: spellings[code].index[0] for code in mixed}
+        affected_rows = [
+            idx for idx, value in genders.items()
+            if canonical[idx] in preferred and value != preferred[canonical[idx]]
+        ]
+        self.validation_issues.append(ValidationIssue(
+            issue_type=IssueType.INFO,
+            severity=Severity.LOW,
+            category=Category.ANOMALY,
+            title="Inconsistent Gender Coding",
+            description=f"{len(affected_rows)} employees use a different gender code than the rest of the file.",
+            affected_rows=affected_rows,
+            affected_employees=len(affected_rows),
+            suggested_action="Use one coding for gender throughout the file (e.g. 'M'/'F').",
+            auto_fixable=False,
+            confidence_score=0.7,
+            details={
+                "distribution": {str(value): int(count) for value, count in genders.value_counts().items()},
+                "preferred_codes": preferred
+            }
+        ))
+    
     def _detect_mass_events(self):
         """Detect mass hiring/termination events"""
         
@@ -790,27 +892,30 @@ class DataValidationEngine:
                 ValidationResult.file_upload_id == self.file_upload_id
             ).delete()
             
-            # Save new results
-            for issue in self.validation_issues:
-                validation_result = ValidationResult(
-                    file_upload_id=self.file_upload_id,
-                    issue_type=issue.issue_type.value,
-                    severity=issue.severity.value,
-                    category=issue.category.value,
-                    title=issue.title,
-                    description=issue.description,
-                    affected_rows=issue.affected_rows,
-                    affected_employees=issue.affected_employees,
-                    suggested_action=issue.suggested_action,
-                    auto_fixable=issue.auto_fixable,
-                    is_resolved=issue.is_resolved,
-                    confidence_score=issue.confidence_score,
-                    details=issue.details,
-                    resolved_at=datetime.now() if issue.is_resolved else None,
-                    resolution_notes="Auto-fixed" if issue.is_resolved else None,
-                    resolved_by=None  # Set to None since we're not tracking user resolution yet
-                )
-                self.db.add(validation_result)
+            # Save new results in a single executemany insert
+            result_rows = [
+                {
+                    "file_upload_id": self.file_upload_id,
+                    "issue_type": issue.issue_type.value,
+                    "severity": issue.severity.value,
+                    "category": issue.category.value,
+                    "title": issue.title,
+                    "description": issue.description,
+                    "affected_rows": issue.affected_rows,
+                    "affected_employees": issue.affected_employees,
+                    "suggested_action": issue.suggested_action,
+                    "auto_fixable": issue.auto_fixable,
+                    "is_resolved": issue.is_resolved,
+                    "confidence_score": issue.confidence_score,
+                    "details": issue.details,
+                    "resolved_at": datetime.now() if issue.is_resolved else None,
+                    "resolution_notes": "Auto-fixed" if issue.is_resolved else None,
+                    "resolved_by": None  # Set to None since we're not tracking user resolution yet
+                }
+                for issue in self.validation_issues
+            ]
+            if result_rows:
+                self.db.execute(ValidationResult.__table__.insert(), result_rows)
             
             # Count issues by type
             critical_count = len([i for i in self.validation_issues if i.issue_type == IssueType.CRITICAL])
@@ -868,6 +973,34 @@ class DataValidationEngine:
             logger.error(f"Error saving validation results: {str(e)}")
             raise
     
+    def load_saved_results(self, data_quality_score: float) -> Tuple[List[ValidationIssue], float]:
+        """
+        Rebuild the issue list from the results saved by a previous run
+        instead of re-running every check
+        """
+        self.validation_issues = [
+            ValidationIssue(
+                id=result.id,
+                file_upload_id=result.file_upload_id,
+                issue_type=IssueType(result.issue_type),
+                severity=Severity(result.severity),
+                category=Category(result.category),
+                title=result.title,
+                description=result.description,
+                affected_rows=result.affected_rows or [],
+                suggested_action=result.suggested_action,
+                auto_fixable=result.auto_fixable,
+                is_resolved=result.is_resolved,
+                confidence_score=float(result.confidence_score or 0.0),
+                details=result.details or {},
+                created_at=result.created_at
+            )
+            for result in sorted(self.existing_results, key=lambda result: result.id)
+        ]
+        self.data_quality_score = data_quality_score
+        
+        return self.validation_issues, self.data_quality_score
+    
     def get_auto_fixable_issues(self) -> List[ValidationIssue]:
         """Get list of issues that can be automatically fixed"""
         return [issue for issue in self.validation_issues if issue.auto_fixable]
@@ -0,0 +1,10 @@
+import pytest
+
+from test_api import live_client
+
+@pytest.fixture(scope="module")
+def client():
+    # Created per test module rather than when test_api is imported, and
+    # shared by its live-server checks
+    with live_client() as client:
+        yield client
@@ -1,14 +1,24 @@
 print("Starting main.py...")
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Query, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Optional, Iterator, BinaryIO, Collection, Tuple
 import os
+import shutil
+import base64
+import hashlib
+import itertools
+from functools import lru_cache
 from datetime import datetime
 import pandas as pd
-import io
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import pyarrow.parquet as pq
 import logging
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import JSONResponse, ORJSONResponse
+from rapidfuzz import fuzz, process
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.core.database import get_db, Base, engine
 from app.models.models import (
     FileUpload,
@@ -21,19 +31,23 @@ from app.models.models import (
     FixHistory,
     FixSession,
     FixTemplate,
-    ComplianceTestRun
+    ComplianceTestRun,
+    ComplianceTestResult,
+    DataCorrection
 )
-from app.services.validation_engine import DataValidationEngine
+from app.services.validation_engine import DataValidationEngine, VALIDATED_COLUMNS, diff_corrections, load_corrections, apply_corrections
 from app.routers import fix_issue_routes
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic (`alembic upgrade head`); set AUTO_CREATE_TABLES
+# to create any missing tables at startup during local development
+if os.getenv("AUTO_CREATE_TABLES"):
+    Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Include routers
 app.include_router(
@@ -54,6 +68,9 @@ app.add_middleware(
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Rows parsed per chunk when streaming CSV uploads into the database
+CSV_CHUNK_ROWS = 50_000
+
 # Standard column names for 401k data
 STANDARD_COLUMNS = {
     'ssn': 'SSN',
@@ -92,12 +109,80 @@ COLUMN_VARIATIONS = {
     'EmployerSHContribuion': ['sh_contribution', 'safe_harbor', 'sh_contrib']
 }
 
+# Lookup tables derived once from the static column definitions above
+_STANDARD_TARGETS = frozenset(STANDARD_COLUMNS.values())
+# Spaces and hyphens both normalize to underscores before lookup
+_NORMALIZE = str.maketrans(" -", "__")
+_VARIATIONS_LC = {
+    target: tuple(v.translate(_NORMALIZE).lower() for v in variations)
+    for target, variations in COLUMN_VARIATIONS.items()
+}
+
+# Every known alias -> (target, confidence): variations and snake_case keys
+# score 0.8, a case-insensitive hit on the standard name itself scores 1.0
+_ALIAS_INDEX: Dict[str, tuple[str, float]] = {}
+for _target, _variations in _VARIATIONS_LC.items():
+    for _variation in _variations:
+        # First target listed wins, matching the original scan order
+        _ALIAS_INDEX.setdefault(_variation, (_target, 0.8))
+for _key, _target in STANDARD_COLUMNS.items():
+    _ALIAS_INDEX.setdefault(_key, (_target, 0.8))
+    _ALIAS_INDEX[_target.lower()] = (_target, 1.0)
+# Aliases this short ('fname', 'own', 'match') score highly against any
+# header that merely contains them, so they only ever match exactly
+_FUZZY_CHOICES = [alias for alias in _ALIAS_INDEX if len(alias) > 5]
+
+# All available target columns from our schema, as returned by the mappings endpoint
+_AVAILABLE_TARGET_COLUMNS = {
+    col: {
+        "name": display_name,
+        "variations": COLUMN_VARIATIONS.get(display_name, [])
+    }
+    for col, display_name in STANDARD_COLUMNS.items()
+}
+# Plain edit-distance ratio; a fuzzy hit has to score above this. WRatio's
+# partial matching put 'Middle Name' and 'Pre Tax Deferral' at 80+
+_FUZZY_SCORE_CUTOFF = 85
+
+# pandas' default missing-value tokens; the pyarrow reader uses the same set
+# (its own default lacks 'None' and '<NA>') so both CSV paths agree on what
+# counts as missing and no caller has to re-normalise blanks
+_CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+]
+
+# Identifier targets are always read as text so values such as '012345678'
+# keep their leading zeros
+_TEXT_TARGETS = {"SSN", "EEID"}
+
 def suggest_column_mappings(source_columns: List[str]) -> Dict[str, dict]:
     """Suggest column mappings using multiple matching strategies."""
+    # Hand out copies so callers can't mutate the cached suggestions
+    return {
+        source_col: dict(mapping)
+        for source_col, mapping in _suggest_cached(tuple(source_columns)).items()
+    }
+
+@lru_cache(maxsize=256)
+def _suggest_cached(source_columns: tuple[str, ...]) -> Dict[str, dict]:
+    """Compute suggestions once per distinct header layout."""
     mappings = {}
+    unmatched = []
     
     for source_col in source_columns:
-        source_lower = source_col.lower().replace(' ', '_')
+        # Try exact match first; it needs no normalization
+        if source_col in _STANDARD_TARGETS:
+            mappings[source_col] = {
+                'source_column': source_col,
+                'target_column': source_col,
+                'mapping_type': 'auto_exact',
+                'confidence_score': 1.0
+            }
+            continue
+        
+        source_lower = source_col.translate(_NORMALIZE).lower()
         mapping = {
             'source_column': source_col,
             'target_column': None,
@@ -105,65 +190,245 @@ def suggest_column_mappings(source_columns: List[str]) -> Dict[str, dict]:
             'confidence_score': 0.0
         }
         
-        # Try exact match
-        if source_col in STANDARD_COLUMNS.values():
-            mapping['target_column'] = source_col
-            mapping['mapping_type'] = 'auto_exact'
-            mapping['confidence_score'] = 1.0
-        
-        # Try variation match
-        if not mapping['target_column']:
-            for target, variations in COLUMN_VARIATIONS.items():
-                if source_lower in [v.lower() for v in variations]:
-                    mapping['target_column'] = target
-                    mapping['mapping_type'] = 'auto_fuzzy'
-                    mapping['confidence_score'] = 0.8
-                    break
-        
-        # Try partial match (if no better match found)
-        if not mapping['target_column']:
-            for target, variations in COLUMN_VARIATIONS.items():
-                if any(v.lower() in source_lower or source_lower in v.lower() for v in variations):
-                    mapping['target_column'] = target
-                    mapping['mapping_type'] = 'auto_fuzzy'
-                    mapping['confidence_score'] = 0.6
-                    break
+        # Try alias match
+        hit = _ALIAS_INDEX.get(source_lower)
+        if hit:
+            target, confidence = hit
+            mapping['target_column'] = target
+            mapping['mapping_type'] = 'auto_exact' if confidence == 1.0 else 'auto_fuzzy'
+            mapping['confidence_score'] = confidence
+        else:
+            unmatched.append((mapping, source_lower))
         
         mappings[source_col] = mapping
     
+    # Fuzzy-score every unmatched column against all aliases in one batched,
+    # multi-threaded RapidFuzz call (scores under the cutoff come back as 0)
+    if unmatched:
+        scores = process.cdist(
+            [source_lower for _, source_lower in unmatched],
+            _FUZZY_CHOICES,
+            scorer=fuzz.ratio,
+            score_cutoff=_FUZZY_SCORE_CUTOFF,
+            workers=-1
+        )
+        best_matches = []
+        for (mapping, _), row in zip(unmatched, scores):
+            best = int(row.argmax())
+            score = float(row[best])
+            if score > _FUZZY_SCORE_CUTOFF:
+                best_matches.append((score, mapping, _ALIAS_INDEX[_FUZZY_CHOICES[best]][0]))
+        
+        # A fuzzy hit never takes a target an exact or alias match already
+        # holds, and of several fuzzy hits on one target only the best keeps it
+        claimed = {mapping['target_column'] for mapping in mappings.values() if mapping['target_column']}
+        for score, mapping, target in sorted(best_matches, key=lambda match: match[0], reverse=True):
+            if target in claimed:
+                continue
+            claimed.add(target)
+            mapping['target_column'] = target
+            mapping['mapping_type'] = 'auto_fuzzy'
+            # Scale into the partial-match tier so fuzzy hits never outrank variations
+            mapping['confidence_score'] = round(0.6 * score / 100, 2)
+    
     return mappings
 
-def process_file(file_content: bytes, filename: str) -> tuple[pd.DataFrame, dict]:
-    """Process the uploaded file and return DataFrame and metadata."""
+def read_file_chunks(file_path: str, filename: str) -> Iterator[pd.DataFrame]:
+    """Yield the file as chunks of raw text; Excel files come back as a single chunk."""
+    if filename.lower().endswith('.csv'):
+        logger.debug("Reading CSV file")
+        yield from pd.read_csv(file_path, chunksize=CSV_CHUNK_ROWS, dtype=str)
+    elif filename.lower().endswith(('.xlsx', '.xls')):
+        logger.debug("Reading Excel file")
+        yield pd.read_excel(file_path, dtype=str)
+    else:
+        raise ValueError("Unsupported file format")
+
+def read_data_file(
+    file_path: str,
+    filename: str,
+    usecols: Optional[Collection[str]] = None,
+    text_columns: Collection[str] = ()
+) -> pd.DataFrame:
+    """Read a saved upload, optionally only the usecols columns, with text_columns kept as strings."""
+    if not filename.lower().endswith('.csv'):
+        return pd.read_excel(
+            file_path,
+            usecols=(lambda column: column in usecols) if usecols is not None else None,
+            dtype={column: str for column in text_columns}
+        )
+    return _read_csv_fast(file_path, usecols, text_columns)
+
+def validation_read_options(file_upload: FileUpload, db: Session) -> Tuple[Optional[set], set]:
+    """Columns the validator needs from an upload, and which of them must stay text.
+
+    These are the mapped source columns plus any header already named like a
+    target or like a column the validator reads directly (Gender,
+    PriorYearComp, ...), mapped or not. Uploads without mappings are read in
+    full.
+    """
+    mappings = db.query(ColumnMapping.source_column, ColumnMapping.target_column).filter(
+        ColumnMapping.file_upload_id == file_upload.id
+    ).all()
+    if not mappings:
+        return None, set(_TEXT_TARGETS)
+    named = {
+        header for header in file_upload.headers or []
+        if header in _STANDARD_TARGETS or header in VALIDATED_COLUMNS
+    }
+    usecols = {source for source, target in mappings if target} | named
+    text_columns = {source for source, target in mappings if target in _TEXT_TARGETS} | (named & _TEXT_TARGETS)
+    return usecols, text_columns
+
+def load_upload_data(file_upload: FileUpload, db: Session) -> pd.DataFrame:
+    """Read the validated columns of an upload with its stored corrections applied; blocking, so endpoints run it in the threadpool."""
+    usecols, text_columns = validation_read_options(file_upload, db)
+    df = read_data_file(file_upload.file_path, file_upload.filename, usecols, text_columns)
+    return apply_corrections(df, load_corrections(db, file_upload.id))
+
+def data_fingerprint(file_upload: FileUpload, db: Session) -> dict:
+    """Identify the exact data a validation run saw: the file on disk, its stored corrections and its column mappings."""
+    stat = os.stat(file_upload.file_path)
+    last_correction = db.execute(
+        select(func.max(DataCorrection.id)).where(DataCorrection.file_upload_id == file_upload.id)
+    ).scalar()
+    # The mappings decide which columns are loaded and which stay text, so a
+    # remap changes the data the validator sees even if the file does not
+    mappings = db.execute(
+        select(ColumnMapping.source_column, ColumnMapping.target_column)
+        .where(ColumnMapping.file_upload_id == file_upload.id)
+        .order_by(ColumnMapping.source_column, ColumnMapping.target_column)
+    ).all()
+    mappings_hash = hashlib.sha256(
+        "\n".join(f"{source}\t{target or ''}" for source, target in mappings).encode()
+    ).hexdigest()
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "last_correction_id": last_correction,
+        "mappings_hash": mappings_hash
+    }
+
+def _read_csv_fast(
+    file_path: str,
+    usecols: Optional[Collection[str]] = None,
+    text_columns: Collection[str] = ()
+) -> pd.DataFrame:
+    """Parse a CSV with pyarrow's multi-threaded reader, falling back to the C engine."""
+    # Column names come from pandas itself, which mangles repeated headers
+    # ('a', 'a.1', ...) and names blank ones ('Unnamed: 3'); stored headers
+    # and column mappings use these names, while pyarrow keeps the raw text
+    header = pd.read_csv(file_path, nrows=0).columns.tolist()
     try:
-        logger.debug(f"Processing file: {filename}")
-        file_buffer = io.BytesIO(file_content)
-        
-        if filename.lower().endswith('.csv'):
-            logger.debug("Reading CSV file")
-            df = pd.read_csv(file_buffer)
-        elif filename.lower().endswith(('.xlsx', '.xls')):
-            logger.debug("Reading Excel file")
-            df = pd.read_excel(file_buffer)
-        else:
-            raise ValueError("Unsupported file format")
+        # Blank cells must come back as NaN, as with the C engine, even in
+        # text columns; pyarrow otherwise turns them into '' and the
+        # validator reports missing values as format errors instead
+        convert_options = pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in text_columns},
+            null_values=_CSV_NULL_VALUES,
+            strings_can_be_null=True
+        )
+        names = header
+        if usecols is not None:
+            # Skip converting columns nobody reads; repeated raw header names
+            # cannot be selected unambiguously, so such files are read in full
+            raw_header = pa_csv.open_csv(file_path).schema.names
+            if len(set(raw_header)) == len(raw_header):
+                selected = [(raw, name) for raw, name in zip(raw_header, header) if name in usecols]
+                if selected:
+                    convert_options.include_columns = [raw for raw, _ in selected]
+                    names = [name for _, name in selected]
+        table = pa_csv.read_csv(file_path, convert_options=convert_options)
+    except pa.ArrowInvalid as e:
+        # pyarrow rejects ragged rows that the C engine pads with NaN
+        logger.debug("pyarrow could not parse %s (%s); using the C engine", file_path, e)
+        return pd.read_csv(
+            file_path,
+            usecols=(lambda column: column in usecols) if usecols is not None else None,
+            dtype={column: str for column in text_columns},
+            low_memory=False,
+            cache_dates=True
+        )
+    # pyarrow infers ISO dates as date/timestamp types; keep them as text so the
+    # validation engine sees the same values the pandas C engine would produce
+    columns = [
+        column.cast(pa.string()) if pa.types.is_temporal(column.type) else column
+        for column in table.columns
+    ]
+    return pa.table(columns, names=names).to_pandas()
+
+def write_raw_snapshot(chunks: Iterator[pd.DataFrame], parquet_path: str) -> int:
+    """Write the parsed rows to a columnar Parquet snapshot and return the row count."""
+    writer = None
+    row_count = 0
+    try:
+        for chunk in chunks:
+            chunk.columns = [str(col) for col in chunk.columns]
+            if writer is None:
+                # Every column is raw text, so the schema holds across chunks
+                # even when a column is entirely empty in one of them
+                schema = pa.schema([(col, pa.string()) for col in chunk.columns])
+                writer = pq.ParquetWriter(parquet_path, schema, compression="zstd")
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            row_count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return row_count
 
-        logger.debug(f"File read successfully. Shape: {df.shape}")
-        logger.debug(f"Columns: {df.columns.tolist()}")
+def parse_date_column(values: pd.Series) -> List[Optional[datetime]]:
+    """Parse a column of YYYY-MM-DD strings at once, mapping failures to None."""
+    parsed = pd.to_datetime(values, format='%Y-%m-%d', errors='coerce', cache=True)
+    return parsed.astype(object).where(parsed.notna(), None).tolist()
+
+def parse_numeric_column(values: pd.Series) -> List[Optional[float]]:
+    """Parse a column of amounts at once, ignoring '$' and thousands separators; missing values become None.
+
+    Raises ValueError naming the rows whose values still are not numbers,
+    rather than storing them as 0.
+    """
+    text = values.astype(object).where(values.isna(), values.astype(str).str.replace(r'[$,\s]', '', regex=True))
+    text = text.where(text != '', None)
+    parsed = pd.to_numeric(text, errors='coerce')
+    invalid = parsed.isna() & text.notna()
+    if invalid.any():
+        rows = invalid[invalid].index.tolist()
+        raise ValueError(f"Non-numeric values in {values.name} at rows {rows[:10]}{' ...' if len(rows) > 10 else ''}")
+    return parsed.astype(object).where(parsed.notna(), None).tolist()
+
+_TRUE_FLAGS = frozenset({"true", "t", "yes", "y", "1", "1.0"})
+
+def parse_flag_column(values: pd.Series) -> List[bool]:
+    """Read a yes/no column, accepting booleans as well as text like 'True', 'Y' or '1'."""
+    return values.astype(str).str.strip().str.lower().isin(_TRUE_FLAGS).tolist()
+
+def nullable_column(values: pd.Series) -> list:
+    """Return a column's values as a list with missing entries as None."""
+    values = values.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+def process_file(file_path: str, filename: str) -> tuple[Iterator[pd.DataFrame], dict]:
+    """Open the saved file and return a DataFrame chunk iterator and metadata."""
+    try:
+        logger.debug("Processing file: %s", filename)
+        chunks = read_file_chunks(file_path, filename)
+        first_chunk = next(chunks)
+        headers = first_chunk.columns.tolist()
+
+        logger.debug("File opened successfully. Columns: %s", headers)
 
         # Get suggested mappings
-        suggested_mappings = suggest_column_mappings(df.columns.tolist())
-        logger.debug(f"Suggested mappings: {suggested_mappings}")
+        suggested_mappings = suggest_column_mappings(headers)
+        logger.debug("Suggested mappings: %s", suggested_mappings)
 
         metadata = {
-            "rows": len(df),
-            "columns": len(df.columns),
-            "headers": df.columns.tolist(),
+            "columns": len(headers),
+            "headers": headers,
             "suggested_mappings": suggested_mappings
         }
         
-        logger.debug(f"Extracted metadata: {metadata}")
-        return df, metadata
+        logger.debug("Extracted metadata: %s", metadata)
+        return itertools.chain([first_chunk], chunks), metadata
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         raise ValueError(f"Error processing file: {str(e)}")
@@ -172,94 +437,104 @@ def process_file(file_content: bytes, filename: str) -> tuple[pd.DataFrame, dict
 async def health_check():
     return {"status": "ok"}
 
+def _ingest_upload(source: BinaryIO, original_filename: str, content_type: Optional[str], db: Session) -> dict:
+    """Save, parse and store an upload; runs in the threadpool to keep the event loop free."""
+    # Generate unique filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{timestamp}_{original_filename}"
+    file_path = os.path.join(UPLOAD_DIR, filename)
+    
+    # Stream the upload straight to disk instead of buffering it in memory
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(source, f, length=1 << 20)
+    file_size = os.path.getsize(file_path)
+    
+    # Process file and get metadata
+    try:
+        chunks, metadata = process_file(file_path, original_filename)
+    except ValueError:
+        os.remove(file_path)
+        raise
+    
+    # Keep the parsed rows as a Parquet snapshot next to the upload rather
+    # than as one JSON row per record in the database
+    logger.debug("Writing raw data snapshot...")
+    parquet_path = f"{file_path}.parquet"
+    try:
+        row_count = write_raw_snapshot(chunks, parquet_path)
+        metadata["rows"] = row_count
+        
+        with db.begin():
+            # Create database record for file upload; flush (not commit) so the
+            # id is available while the mappings join the same transaction
+            db_file = FileUpload(
+                filename=filename,
+                original_filename=original_filename,
+                file_size=file_size,
+                file_path=file_path,
+                mime_type=content_type,
+                column_count=metadata["columns"],
+                headers=metadata["headers"],
+                row_count=row_count,
+                raw_parquet_path=parquet_path,
+                status="uploaded",
+                has_fixes_applied=False
+            )
+            db.add(db_file)
+            db.flush()
+            file_id = db_file.id
+            logger.debug("Created database record for file: %s", file_id)
+            
+            # Store suggested column mappings
+            logger.debug("Storing suggested column mappings...")
+            mapping_payload = [
+                {
+                    "file_upload_id": file_id,
+                    "source_column": source_col,
+                    "target_column": mapping["target_column"],
+                    "mapping_type": mapping.get("mapping_type", "auto_exact"),
+                    "confidence_score": mapping.get("confidence_score", 1.0)
+                }
+                for source_col, mapping in metadata["suggested_mappings"].items()
+                if mapping.get("target_column")
+            ]
+            
+            if mapping_payload:
+                db.execute(ColumnMapping.__table__.insert(), mapping_payload)
+    except Exception:
+        # Do not leave the upload or a half-written snapshot behind
+        for path in (file_path, parquet_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    
+    logger.debug("File record and mappings stored successfully")
+    
+    response_data = {
+        "id": file_id,
+        "filename": filename,
+        "original_filename": original_filename,
+        "file_size": file_size,
+        "file_path": file_path,
+        "mime_type": content_type,
+        "status": "uploaded",
+        "uploaded_at": datetime.now().isoformat() if datetime.now() else None,
+        "rows": metadata["rows"],
+        "columns": metadata["columns"],
+        "headers": metadata["headers"],
+        "suggested_mappings": metadata["suggested_mappings"]
+    }
+    logger.debug("Sending response: %s", response_data)
+    return response_data
+
 @app.post("/api/files/upload")
 async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
     if not file.filename.lower().endswith(('.csv', '.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="Only CSV and Excel files are supported")
     
     try:
-        logger.debug(f"Received file upload: {file.filename}")
-        content = await file.read()
-        
-        # Process file and get metadata
-        df, metadata = process_file(content, file.filename)
-        
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        # Save original file
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # Create database record for file upload
-        db_file = FileUpload(
-            filename=filename,
-            original_filename=file.filename,
-            file_size=len(content),
-            file_path=file_path,
-            mime_type=file.content_type,
-            row_count=metadata["rows"],
-            column_count=metadata["columns"],
-            headers=metadata["headers"],
-            status="uploaded",
-            has_fixes_applied=False
-        )
-        db.add(db_file)
-        db.commit()
-        db.refresh(db_file)
-        logger.debug(f"Created database record for file: {db_file.id}")
-
-        # Store raw data
-        logger.debug("Storing raw data records...")
-        for _, row in df.iterrows():
-            # Convert any non-string values to strings to ensure JSON serialization
-            row_dict = {}
-            for col, val in row.items():
-                if pd.isna(val):
-                    row_dict[col] = None
-                else:
-                    row_dict[col] = str(val) if not isinstance(val, (int, float, bool)) else val
-            
-            raw_record = RawEmployeeData(
-                file_upload_id=db_file.id,
-                row_data=row_dict
-            )
-            db.add(raw_record)
-        
-        # Store suggested column mappings
-        logger.debug("Storing suggested column mappings...")
-        for source_col, mapping in metadata["suggested_mappings"].items():
-            if mapping.get("target_column"):
-                column_mapping = ColumnMapping(
-                    file_upload_id=db_file.id,
-                    source_column=source_col,
-                    target_column=mapping["target_column"],
-                    mapping_type=mapping.get("mapping_type", "auto_exact"),
-                    confidence_score=mapping.get("confidence_score", 1.0)
-                )
-                db.add(column_mapping)
-        
-        db.commit()
-        logger.debug("Raw data and mappings stored successfully")
-        
-        response_data = {
-            "id": db_file.id,
-            "filename": filename,
-            "original_filename": file.filename,
-            "file_size": len(content),
-            "file_path": file_path,
-            "mime_type": file.content_type,
-            "status": "uploaded",
-            "uploaded_at": datetime.now().isoformat() if datetime.now() else None,
-            "rows": metadata["rows"],
-            "columns": metadata["columns"],
-            "headers": metadata["headers"],
-            "suggested_mappings": metadata["suggested_mappings"]
-        }
-        logger.debug(f"Sending response: {response_data}")
-        return response_data
+        logger.debug("Received file upload: %s", file.filename)
+        return await run_in_threadpool(_ingest_upload, file.file, file.filename, file.content_type, db)
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -270,24 +545,28 @@ async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db
 @app.get("/api/files/uploads")
 async def list_uploads(db: Session = Depends(get_db)):
     try:
-        db_files = db.query(FileUpload).all()
-        files = []
-        
-        for db_file in db_files:
-            files.append({
-                "id": db_file.id,
-                "filename": db_file.filename,
-                "original_filename": db_file.original_filename,
-                "file_size": db_file.file_size,
-                "file_path": db_file.file_path,
-                "mime_type": db_file.mime_type,
-                "status": db_file.status,
-                "uploaded_at": db_file.uploaded_at.isoformat() if db_file.uploaded_at else None,
-                "rows": db_file.row_count,
-                "columns": db_file.column_count,
-                "headers": db_file.headers
-            })
-        return files
+        # Select only the listed columns and stream them as plain rows,
+        # skipping ORM instance construction for every upload
+        rows = db.execute(
+            select(
+                FileUpload.id,
+                FileUpload.filename,
+                FileUpload.original_filename,
+                FileUpload.file_size,
+                FileUpload.file_path,
+                FileUpload.mime_type,
+                FileUpload.status,
+                FileUpload.uploaded_at,
+                FileUpload.row_count.label("rows"),
+                FileUpload.column_count.label("columns"),
+                FileUpload.headers
+            ).execution_options(yield_per=500)
+        ).mappings()
+        
+        return [
+            {**row, "uploaded_at": row["uploaded_at"].isoformat() if row["uploaded_at"] else None}
+            for row in rows
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -337,21 +616,12 @@ async def get_column_mappings(file_id: int, db: Session = Depends(get_db)):
                 "confidence_score": float(mapping.confidence_score) if mapping.confidence_score else None
             }
             
-        # Get all available target columns from our schema
-        available_target_columns = {
-            col: {
-                "name": display_name,
-                "variations": COLUMN_VARIATIONS.get(display_name, [])
-            }
-            for col, display_name in STANDARD_COLUMNS.items()
-        }
-        
         return {
             "file_id": file_id,
             "original_filename": file_upload.original_filename,
             "source_columns": file_upload.headers,
             "current_mappings": current_mappings,
-            "available_target_columns": available_target_columns,
+            "available_target_columns": _AVAILABLE_TARGET_COLUMNS,
             "unmapped_columns": [
                 col for col in file_upload.headers 
                 if col not in current_mappings or not current_mappings[col]["target_column"]
@@ -375,37 +645,39 @@ async def update_column_mappings(
             raise HTTPException(status_code=404, detail="File not found")
             
         # Validate target columns
-        invalid_targets = [target for target in mappings.values() 
-                         if target and target not in STANDARD_COLUMNS.values()]
+        invalid_targets = {target for target in mappings.values() if target} - _STANDARD_TARGETS
         if invalid_targets:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid target columns: {', '.join(invalid_targets)}"
+                detail=f"Invalid target columns: {', '.join(sorted(invalid_targets))}"
             )
             
-        # Update mappings
-        for source_col, target_col in mappings.items():
-            # Find existing mapping
-            mapping = db.query(ColumnMapping).filter(
+        # Fetch every existing mapping for these source columns in one query;
+        # ix_cm_file_src guarantees at most one row per source column
+        existing = dict(
+            db.query(ColumnMapping.source_column, ColumnMapping.id).filter(
                 ColumnMapping.file_upload_id == file_id,
-                ColumnMapping.source_column == source_col
-            ).first()
-            
-            if mapping:
-                # Update existing mapping
-                mapping.target_column = target_col
-                mapping.mapping_type = "manual"
-                mapping.confidence_score = 1.0
+                ColumnMapping.source_column.in_(list(mappings))
+            ).all()
+        )
+        
+        updates = []
+        inserts = []
+        for source_col, target_col in mappings.items():
+            values = {
+                "target_column": target_col,
+                "mapping_type": "manual",
+                "confidence_score": 1.0
+            }
+            if source_col in existing:
+                updates.append({"id": existing[source_col], **values})
             else:
-                # Create new mapping
-                mapping = ColumnMapping(
-                    file_upload_id=file_id,
-                    source_column=source_col,
-                    target_column=target_col,
-                    mapping_type="manual",
-                    confidence_score=1.0
-                )
-                db.add(mapping)
+                inserts.append({"file_upload_id": file_id, "source_column": source_col, **values})
+        
+        if updates:
+            db.bulk_update_mappings(ColumnMapping, updates)
+        if inserts:
+            db.bulk_insert_mappings(ColumnMapping, inserts)
         
         db.commit()
         
@@ -426,58 +698,87 @@ async def process_file_endpoint(file_id: int, db: Session = Depends(get_db)):
     
     try:
         # Load the data into a DataFrame
-        if file_upload.filename.endswith('.csv'):
-            df = pd.read_csv(file_upload.file_path)
-        else:
-            df = pd.read_excel(file_upload.file_path)
+        df = await run_in_threadpool(load_upload_data, file_upload, db)
 
         # Trigger validation process
         validation_engine = DataValidationEngine(df, file_id, db)
         issues, quality_score = validation_engine.run_comprehensive_validation()
         validation_engine.save_validation_results()
         
-        # Get the raw data records
-        raw_records = db.query(RawEmployeeData).filter(RawEmployeeData.file_upload_id == file_id).all()
-        
         # Get column mappings
         column_mappings = db.query(ColumnMapping).filter(ColumnMapping.file_upload_id == file_id).all()
         mapping_dict = {m.source_column: m.target_column for m in column_mappings}
         
-        # Process each raw record and create EmployeeData records
-        for raw_record in raw_records:
-            row_data = raw_record.row_data
-            
-            # Map the data according to column mappings
-            mapped_data = {}
-            for source_col, value in row_data.items():
-                if source_col in mapping_dict:
-                    target_col = mapping_dict[source_col]
-                    mapped_data[target_col] = value
-            
-            # Create EmployeeData record
-            employee_record = EmployeeData(
-                file_upload_id=file_id,
-                ssn=mapped_data.get('SSN'),
-                eeid=mapped_data.get('EEID'),
-                first_name=mapped_data.get('FirstName'),
-                last_name=mapped_data.get('LastName'),
-                dob=datetime.strptime(mapped_data.get('DOB', ''), '%Y-%m-%d') if mapped_data.get('DOB') else None,
-                doh=datetime.strptime(mapped_data.get('DOH', ''), '%Y-%m-%d') if mapped_data.get('DOH') else None,
-                dot=datetime.strptime(mapped_data.get('DOT', ''), '%Y-%m-%d') if mapped_data.get('DOT') else None,
-                hours_worked=float(mapped_data.get('HoursWorked', 0)),
-                ownership_percentage=float(mapped_data.get('%Ownership', 0)),
-                is_officer=bool(mapped_data.get('Officer', False)),
-                prior_year_comp=float(mapped_data.get('PriorYearComp', 0)),
-                employee_deferrals=float(mapped_data.get('EmployeeDeferrals', 0)),
-                employer_match=float(mapped_data.get('EmployerMatch', 0)),
-                employer_profit_sharing=float(mapped_data.get('EmployerProfitSharing', 0)),
-                employer_sh_contribution=float(mapped_data.get('EmployerSHContribution', 0))
+        # Map the raw data according to column mappings. Uploads keep their raw
+        # rows in a Parquet snapshot; older uploads still have them as JSON rows
+        raw_records = []
+        if file_upload.raw_parquet_path and os.path.exists(file_upload.raw_parquet_path):
+            raw_df = await run_in_threadpool(pd.read_parquet, file_upload.raw_parquet_path)
+            mapped_df = raw_df[[col for col in raw_df.columns if col in mapping_dict]]
+            mapped_df = mapped_df.set_axis([mapping_dict[col] for col in mapped_df.columns], axis=1)
+            # When two source columns share a target, the later one wins
+            mapped_df = mapped_df.loc[:, ~mapped_df.columns.duplicated(keep='last')]
+        else:
+            raw_records = db.query(RawEmployeeData.id, RawEmployeeData.row_data).filter(
+                RawEmployeeData.file_upload_id == file_id
+            ).all()
+            mapped_df = pd.DataFrame(
+                [
+                    {
+                        mapping_dict[source_col]: value
+                        for source_col, value in raw_record.row_data.items()
+                        if source_col in mapping_dict
+                    }
+                    for raw_record in raw_records
+                ],
+                index=range(len(raw_records))
             )
-            
-            db.add(employee_record)
-            
-            # Link the raw record to the mapped record
-            raw_record.mapped_record = employee_record
+        
+        # Convert each target column in one vectorized pass; targets nobody
+        # mapped come back empty
+        mapped_df = mapped_df.reindex(columns=[
+            'SSN', 'EEID', 'FirstName', 'LastName', 'DOB', 'DOH', 'DOT', 'HoursWorked',
+            '%Ownership', 'Officer', 'PriorYearComp', 'EmployeeDeferrals', 'EmployerMatch',
+            'EmployerProfitSharing', 'EmployerSHContribution'
+        ])
+        employee_columns = {
+            "ssn": nullable_column(mapped_df['SSN']),
+            "eeid": nullable_column(mapped_df['EEID']),
+            "first_name": nullable_column(mapped_df['FirstName']),
+            "last_name": nullable_column(mapped_df['LastName']),
+            "dob": parse_date_column(mapped_df['DOB']),
+            "doh": parse_date_column(mapped_df['DOH']),
+            "dot": parse_date_column(mapped_df['DOT']),
+            "hours_worked": parse_numeric_column(mapped_df['HoursWorked']),
+            "ownership_percentage": parse_numeric_column(mapped_df['%Ownership']),
+            "is_officer": parse_flag_column(mapped_df['Officer']),
+            "prior_year_comp": parse_numeric_column(mapped_df['PriorYearComp']),
+            "employee_deferrals": parse_numeric_column(mapped_df['EmployeeDeferrals']),
+            "employer_match": parse_numeric_column(mapped_df['EmployerMatch']),
+            "employer_profit_sharing": parse_numeric_column(mapped_df['EmployerProfitSharing']),
+            "employer_sh_contribution": parse_numeric_column(mapped_df['EmployerSHContribution'])
+        }
+        employee_rows = [
+            {"file_upload_id": file_id, **dict(zip(employee_columns, values))}
+            for values in zip(*employee_columns.values())
+        ]
+        
+        if employee_rows and raw_records:
+            # Bulk insert the EmployeeData records, getting their ids back in
+            # parameter order so each raw record can be linked to its mapped record
+            employee_ids = db.scalars(
+                insert(EmployeeData).returning(EmployeeData.id, sort_by_parameter_order=True),
+                employee_rows
+            ).all()
+            db.execute(
+                update(RawEmployeeData),
+                [
+                    {"id": raw_record.id, "mapped_record_id": employee_id}
+                    for raw_record, employee_id in zip(raw_records, employee_ids)
+                ]
+            )
+        elif employee_rows:
+            db.execute(insert(EmployeeData), employee_rows)
         
         # Update the status to processed
         file_upload.status = "processed"
@@ -534,10 +835,8 @@ async def run_data_validation(file_id: int, db: Session = Depends(get_db)):
                 
             logger.info(f"File path: {file_upload.file_path}")
             logger.info(f"Loading file from {file_upload.file_path}")
-            if file_upload.filename.endswith('.csv'):
-                df = pd.read_csv(file_upload.file_path)
-            else:
-                df = pd.read_excel(file_upload.file_path)
+            fingerprint = data_fingerprint(file_upload, db)
+            df = await run_in_threadpool(load_upload_data, file_upload, db)
             
             logger.info(f"Running validation engine on file with {len(df)} rows")
             # Run validation
@@ -563,13 +862,16 @@ async def run_data_validation(file_id: int, db: Session = Depends(get_db)):
             validation_run.total_issues_found = len(issues)
             validation_run.data_quality_score = quality_score
             validation_run.can_proceed_to_compliance = len([i for i in issues if i.issue_type.value == "critical"]) == 0
+            # Record which data was validated so auto-fix can reuse these results
+            validation_run.validation_config = {**(validation_run.validation_config or {}), "data_fingerprint": fingerprint}
             
             db.commit()
             logger.info(f"Validation run completed and saved with ID: {validation_run.id}")
             
-            # Verify the validation run was updated correctly
-            updated_run = db.query(ValidationRun).filter(ValidationRun.id == validation_run.id).first()
-            logger.info(f"Verified validation run status: {updated_run.status}, score: {updated_run.data_quality_score}")
+            # Verify the validation run was updated correctly; sessions keep
+            # objects loaded after commit, so re-read the row from the database
+            db.refresh(validation_run)
+            logger.info(f"Verified validation run status: {validation_run.status}, score: {validation_run.data_quality_score}")
             
             return {
                 "validation_run_id": validation_run.id,
@@ -605,10 +907,28 @@ async def get_validation_results(file_id: int, db: Session = Depends(get_db)):
         if not file_upload:
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Get validation results
-        validation_results = db.query(ValidationResult).filter(
-            ValidationResult.file_upload_id == file_id
-        ).order_by(ValidationResult.created_at.desc()).all()
+        # Get validation results as plain rows of just the returned columns;
+        # ix_valres_file_created serves both the filter and the ordering
+        validation_results = db.execute(
+            select(
+                ValidationResult.id,
+                ValidationResult.issue_type,
+                ValidationResult.severity,
+                ValidationResult.category,
+                ValidationResult.title,
+                ValidationResult.description,
+                ValidationResult.affected_rows,
+                ValidationResult.affected_employees,
+                ValidationResult.suggested_action,
+                ValidationResult.auto_fixable,
+                ValidationResult.is_resolved,
+                ValidationResult.confidence_score,
+                ValidationResult.details,
+                ValidationResult.created_at
+            ).where(
+                ValidationResult.file_upload_id == file_id
+            ).order_by(ValidationResult.created_at.desc())
+        ).all()
         
         # Get data quality score
         quality_score = db.query(DataQualityScore).filter(
@@ -695,23 +1015,35 @@ async def auto_fix_issues(file_id: int, db: Session = Depends(get_db)):
         if not os.path.exists(file_upload.file_path):
             raise HTTPException(status_code=404, detail=f"File not found at path: {file_upload.file_path}")
             
-        if file_upload.filename.endswith('.csv'):
-            df = pd.read_csv(file_upload.file_path)
-        else:
-            df = pd.read_excel(file_upload.file_path)
+        fingerprint = data_fingerprint(file_upload, db)
+        df = await run_in_threadpool(load_upload_data, file_upload, db)
         
-        # Run validation and apply fixes
+        # Reuse the saved results when the latest validation run saw exactly
+        # this data; otherwise validate again before applying fixes
+        latest_run = db.query(ValidationRun).filter(
+            ValidationRun.file_upload_id == file_id
+        ).order_by(ValidationRun.id.desc()).first()
         validation_engine = DataValidationEngine(df, file_id, db)
-        issues, quality_score = validation_engine.run_comprehensive_validation()
+        if (
+            latest_run is not None
+            and latest_run.status == "completed"
+            and (latest_run.validation_config or {}).get("data_fingerprint") == fingerprint
+        ):
+            issues, quality_score = validation_engine.load_saved_results(float(latest_run.data_quality_score))
+        else:
+            issues, quality_score = validation_engine.run_comprehensive_validation()
         
         # Apply auto-fixes
         corrected_df = validation_engine.apply_auto_fixes()
         
-        # Save corrected data back to the original file
-        if file_upload.filename.endswith('.csv'):
-            corrected_df.to_csv(file_upload.file_path, index=False)
-        else:
-            corrected_df.to_excel(file_upload.file_path, index=False)
+        # Store only the changed cells; they are replayed whenever the file is
+        # read, so the original upload is never rewritten
+        corrections = diff_corrections(df, corrected_df)
+        if corrections:
+            db.execute(
+                DataCorrection.__table__.insert(),
+                [{"file_upload_id": file_id, **correction} for correction in corrections]
+            )
         
         # Update validation results
         validation_engine.save_validation_results()
@@ -768,27 +1100,34 @@ async def get_data_quality_score(file_id: int, db: Session = Depends(get_db)):
         logger.error(f"Error getting quality score: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Plain def: the queries are blocking, so FastAPI runs this in its threadpool
+# instead of stalling the event loop
 @app.get("/api/files/{file_id}/quality-score")
-async def get_quality_score(file_id: int, db: Session = Depends(get_db)):
+def get_quality_score(file_id: int, db: Session = Depends(get_db)):
     """Get the data quality score for a file"""
     try:
         # First check if the file exists
-        file_upload = db.query(FileUpload).filter(FileUpload.id == file_id).first()
+        file_upload = db.query(FileUpload.id).filter(FileUpload.id == file_id).first()
         if not file_upload:
             return JSONResponse(
                 status_code=404,
                 content={"detail": "File not found"}
             )
             
-        # Get the latest validation run for this file
-        validation_run = db.query(ValidationRun).filter(
+        # Get the latest validation run for this file, as a row of just the
+        # columns returned below rather than a full ORM object
+        validation_run = db.query(
+            ValidationRun.id,
+            ValidationRun.data_quality_score,
+            ValidationRun.completed_at
+        ).filter(
             ValidationRun.file_upload_id == file_id,
             ValidationRun.status == "completed"
         ).order_by(ValidationRun.completed_at.desc()).first()
         
         if not validation_run:
             # Check if there's any validation run (even if not completed)
-            any_validation_run = db.query(ValidationRun).filter(
+            any_validation_run = db.query(ValidationRun.status).filter(
                 ValidationRun.file_upload_id == file_id
             ).order_by(ValidationRun.started_at.desc()).first()
             
@@ -831,19 +1170,73 @@ async def get_quality_score(file_id: int, db: Session = Depends(get_db)):
             content={"detail": str(e)}
         )
 
+def encode_history_cursor(run_date: datetime, run_id: int) -> str:
+    """Opaque keyset cursor pointing just past a compliance run."""
+    return base64.urlsafe_b64encode(f"{run_date.isoformat()}|{run_id}".encode()).decode()
+
+def decode_history_cursor(cursor: str) -> tuple:
+    """Inverse of encode_history_cursor; raises ValueError on a malformed cursor."""
+    try:
+        run_date, run_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(run_date), int(run_id)
+    except (UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+# Plain def: the queries are blocking, so FastAPI runs this in its threadpool
+# instead of stalling the event loop
 @app.get("/api/compliance/history")
-async def get_compliance_history(db: Session = Depends(get_db)):
-    """Get full compliance test history"""
+def get_compliance_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get compliance test history, newest first, one keyset page at a time"""
     try:
-        # Get all test runs with detailed results
-        test_runs = db.query(ComplianceTestRun)\
+        position = decode_history_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Runs and their results are only ever appended, so the newest ids and
+        # the run count identify the history's state; a dashboard polling an
+        # unchanged history gets a 304 after this one cheap query
+        latest_run_id, run_count, latest_result_id = db.execute(
+            select(
+                func.max(ComplianceTestRun.id),
+                func.count(ComplianceTestRun.id),
+                select(func.max(ComplianceTestResult.id)).scalar_subquery()
+            )
+        ).one()
+        etag = f'W/"{latest_run_id}-{run_count}-{latest_result_id}"'
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
+        # Get one page of test runs with detailed results: the file joins in
+        # one row per run (only the name is needed, not its headers or paths),
+        # while the results come from a single IN query
+        # instead of repeating every run and file column once per result.
+        # (run_date, id) keeps the order total when run dates tie.
+        query = db.query(ComplianceTestRun)\
             .options(
-                joinedload(ComplianceTestRun.file),
-                joinedload(ComplianceTestRun.test_results)
-            )\
-            .order_by(ComplianceTestRun.run_date.desc())\
+                joinedload(ComplianceTestRun.file).load_only(FileUpload.original_filename),
+                selectinload(ComplianceTestRun.test_results)
+            )
+        if position:
+            query = query.filter(tuple_(ComplianceTestRun.run_date, ComplianceTestRun.id) < position)
+        test_runs = query\
+            .order_by(ComplianceTestRun.run_date.desc(), ComplianceTestRun.id.desc())\
+            .limit(limit + 1)\
             .all()
         
+        # The extra row only tells us whether another page exists
+        next_cursor = None
+        if len(test_runs) > limit:
+            test_runs = test_runs[:limit]
+            next_cursor = encode_history_cursor(test_runs[-1].run_date, test_runs[-1].id)
+        
         history = []
         for run in test_runs:
             detailed_results = []
@@ -871,7 +1264,7 @@ async def get_compliance_history(db: Session = Depends(get_db)):
                 "results": detailed_results
             })
         
-        return {"test_runs": history}
+        return {"test_runs": history, "next_cursor": next_cursor}
         
     except Exception as e:
         logger.error(f"Error fetching compliance history: {str(e)}")
@@ -883,7 +1276,7 @@ async def get_compliance_results(db: Session = Depends(get_db)):
     try:
         # Get recent test runs with file info
         recent_runs = db.query(ComplianceTestRun)\
-            .options(joinedload(ComplianceTestRun.file))\
+            .options(joinedload(ComplianceTestRun.file).load_only(FileUpload.original_filename))\
             .order_by(ComplianceTestRun.run_date.desc())\
             .limit(10)\
             .all()
@@ -1,26 +1,149 @@
-import requests
+import httpx
 import json
+from contextlib import contextmanager
+from sqlalchemy import event
 
 BASE_URL = "http://localhost:8000"
 
-def test_health():
-    response = requests.get(f"{BASE_URL}/health")
+def live_client():
+    """Keep-alive client for the live-server checks, so they reuse one connection; close it when done"""
+    return httpx.Client(base_url=BASE_URL, timeout=10)
+
+def test_health(client):
+    response = client.get("/health")
     print("Health Check Response:", response.json())
 
-def test_file_upload():
+def test_file_upload(client):
     files = {'file': ('test_data.csv', open('test_data.csv', 'rb'), 'text/csv')}
-    response = requests.post(f"{BASE_URL}/api/files/upload", files=files)
+    response = client.post("/api/files/upload", files=files)
     print("File Upload Response:", response.json())
 
-def test_list_uploads():
-    response = requests.get(f"{BASE_URL}/api/files/uploads")
+def test_list_uploads(client):
+    response = client.get("/api/files/uploads")
     print("List Uploads Response:", response.json())
 
+@contextmanager
+def count_queries(engine):
+    """Collect every SQL statement the engine executes inside the block"""
+    queries = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def test_compliance_history_queries():
+    # Runs in-process against the app's own engine so the statements can be
+    # counted: the ETag probe, one query for runs with their files and one for
+    # all their results, however long the history is
+    from fastapi.testclient import TestClient
+    from main import app
+    from app.core.database import engine
+    
+    app_client = TestClient(app)
+    with count_queries(engine) as queries:
+        response = app_client.get("/api/compliance/history")
+    print("Compliance History Queries:", len(queries))
+    assert response.status_code == 200
+    assert len(queries) <= 3, f"Expected at most 3 queries, got {len(queries)}"
+    
+    # An unchanged history is answered from the ETag probe alone
+    with count_queries(engine) as queries:
+        cached = app_client.get("/api/compliance/history", headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
+    assert len(queries) <= 1, f"Expected at most 1 query, got {len(queries)}"
+
+def test_blank_cells_match_c_engine():
+    # Saved uploads are read with pyarrow; blank SSN/DOB/name cells have to
+    # reach the validator as missing values exactly as the C engine reports them
+    import os
+    import tempfile
+    import pandas as pd
+    from main import _read_csv_fast
+    from app.core.database import SessionLocal
+    from app.services.validation_engine import DataValidationEngine
+    
+    csv = (
+        "SSN,FirstName,LastName,DOB,DOH,PriorYearComp\n"
+        "123-45-6789,Ann,Lee,1980-01-02,2010-05-01,50000\n"
+        "987-65-4321,Bob,,,2012-06-01,42000\n"
+        ",Cy,Ray,1975-03-04,2015-01-01,61000\n"
+        "None,Di,<NA>,N/A,2016-02-01,38000\n"
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+        f.write(csv)
+    
+    db = SessionLocal()
+    try:
+        def issues(df):
+            found, _ = DataValidationEngine(df, 0, db).run_comprehensive_validation()
+            return sorted((issue.title, tuple(issue.affected_rows)) for issue in found)
+        
+        fast = issues(_read_csv_fast(f.name, text_columns={"SSN"}))
+        c_engine = issues(pd.read_csv(f.name, dtype={"SSN": str}, low_memory=False))
+    finally:
+        db.close()
+        os.remove(f.name)
+    print("Blank Cell Issues:", fast)
+    assert fast == c_engine, f"pyarrow path {fast} != C engine {c_engine}"
+
+def test_fuzzy_mapping_negatives():
+    # Headers that only share a word or a short alias with a target must stay
+    # unmapped, and a fuzzy hit never takes a target an exact column holds
+    from main import suggest_column_mappings
+    
+    unrelated = [
+        "Middle Name", "Full Name", "Spouse Name", "Beneficiary Name", "Employee Name",
+        "Union", "Catch-up Deferral", "Pre Tax Deferral", "Address", "City", "Gender"
+    ]
+    mappings = suggest_column_mappings(["First Name", "Deferrals"] + unrelated)
+    wrong = {column: mappings[column]["target_column"] for column in unrelated if mappings[column]["target_column"]}
+    print("Fuzzy Mapping Negatives:", wrong)
+    assert not wrong, f"Unrelated headers were mapped: {wrong}"
+    assert mappings["First Name"]["target_column"] == "FirstName"
+    assert mappings["Deferrals"]["target_column"] == "EmployeeDeferrals"
+    
+    # Typos and abbreviations still match, but not onto a claimed target
+    mappings = suggest_column_mappings(["hire_dt", "dt_of_birth", "first_nm", "FirstName"])
+    assert mappings["hire_dt"]["target_column"] == "DOH"
+    assert mappings["dt_of_birth"]["target_column"] == "DOB"
+    assert mappings["first_nm"]["target_column"] is None
+
+def test_gender_check_on_mapped_upload():
+    # Gender has no mapping target, but the validator reads it by name, so it
+    # must still be loaded once the upload's other columns are mapped
+    from fastapi.testclient import TestClient
+    from main import app
+    
+    csv = (
+        "SSN,First Name,Last Name,DOB,DOH,PriorYearComp,Gender\n"
+        "123-45-6789,Ann,Lee,1980-01-02,2010-05-01,50000,F\n"
+        "987-65-4321,Bob,Ray,1975-03-04,2012-06-01,42000,M\n"
+        "555-12-3456,Cy,Fox,1990-07-08,2015-01-01,61000,Male\n"
+    )
+    app_client = TestClient(app)
+    upload = app_client.post("/api/files/upload", files={'file': ('gender.csv', csv.encode(), 'text/csv')})
+    assert upload.status_code == 200
+    file_id = upload.json()["id"]
+    assert app_client.post(f"/api/files/{file_id}/validate").status_code == 200
+    
+    results = app_client.get(f"/api/files/{file_id}/validation-results").json()
+    titles = {issue["title"] for issue in results["issues"]}
+    print("Mapped Upload Issues:", sorted(titles))
+    assert "Inconsistent Gender Coding" in titles
+
 if __name__ == "__main__":
     print("Testing API endpoints...")
-    try:
-        test_health()
-        test_file_upload()
-        test_list_uploads()
-    except Exception as e:
-        print(f"Error testing API: {str(e)}") 
\ No newline at end of file
+    with live_client() as client:
+        try:
+            test_health(client)
+            test_file_upload(client)
+            test_list_uploads(client)
+            test_compliance_history_queries()
+            test_blank_cells_match_c_engine()
+            test_fuzzy_mapping_negatives()
+            test_gender_check_on_mapped_upload()
+        except Exception as e:
+            print(f"Error testing API: {str(e)}") 
\ No newline at end of file
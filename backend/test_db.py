@@ -14,29 +14,35 @@ def test_connection():
     print(f"Database name: {db_name}")
     
     try:
-        # Connect to PostgreSQL server
-        conn = psycopg2.connect(base_url + '/postgres')
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        cur = conn.cursor()
-        
-        # Check if database exists
-        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
-        exists = cur.fetchone()
-        
-        if not exists:
+        # Connect straight to the target database: when it already exists
+        # (the usual case) that is one connection and one query. Only a
+        # missing database needs the maintenance connection to create it
+        print(f"\nTesting connection to '{db_name}'...")
+        try:
+            conn = psycopg2.connect(DATABASE_URL)
+            print(f"\nDatabase '{db_name}' already exists.")
+        except psycopg2.OperationalError:
+            # Connect to PostgreSQL server
+            admin_conn = psycopg2.connect(base_url + '/postgres')
+            admin_conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            cur = admin_conn.cursor()
+            
+            # Check if database exists
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
+            if cur.fetchone():
+                # It exists, so the first connection failed for another reason
+                raise
+            
             print(f"\nDatabase '{db_name}' does not exist. Creating it...")
             cur.execute(f'CREATE DATABASE {db_name}')
             print(f"Database '{db_name}' created successfully!")
-        else:
-            print(f"\nDatabase '{db_name}' already exists.")
+            
+            # Close connection to postgres database
+            cur.close()
+            admin_conn.close()
+            
+            conn = psycopg2.connect(DATABASE_URL)
         
-        # Close connection to postgres database
-        cur.close()
-        conn.close()
-        
-        # Try to connect to the actual database
-        print(f"\nTesting connection to '{db_name}'...")
-        conn = psycopg2.connect(DATABASE_URL)
         cur = conn.cursor()
         cur.execute('SELECT version();')
         version = cur.fetchone()
@@ -21,10 +21,13 @@ from app.routers import files
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Recreate database tables
-logger.info("Recreating database tables...")
-recreate_tables()
-logger.info("Database tables recreated successfully")
+# Recreating drops the whole schema, so it only runs when explicitly asked
+# for (KPLAN_RECREATE_DB=1) instead of on every import and worker start;
+# `python recreate_db.py` does the same on demand
+if os.getenv("KPLAN_RECREATE_DB") == "1":
+    logger.info("Recreating database tables...")
+    recreate_tables()
+    logger.info("Database tables recreated successfully")
 
 app = FastAPI()
 